@@ -1,8 +1,123 @@
+import bisect
+import copy
+import functools
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, FrozenSet, Iterator, Optional, Tuple, Union
 import openai
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Merged configs already read in this process, keyed by resolved config dir
+_CONFIG_CACHE: Dict[Path, Dict] = {}
+_CONFIG_LOCK = threading.Lock()
+
+# Merged configs pickled across runs, invalidated by config file mtime/size
+_CONFIG_CACHE_FILE = Path.home() / '.cache' / 'read-you' / 'config.pkl'
+
+# Directories never descended into when analyzing a repository
+_IGNORE_DIRS = frozenset({'.git', 'node_modules', '.venv', 'venv', '__pycache__', 'build', 'dist'})
+
+# Common entry points and important files by language
+_IMPORTANT_PATTERNS = {
+    '.py': frozenset({'main.py', 'app.py', 'index.py', 'setup.py'}),
+    '.js': frozenset({'index.js', 'main.js', 'app.js', 'server.js'}),
+    '.ts': frozenset({'index.ts', 'main.ts', 'app.ts', 'server.ts'}),
+    '.go': frozenset({'main.go', 'app.go', 'server.go'}),
+    '.rs': frozenset({'main.rs', 'lib.rs'}),
+    '.java': frozenset({'Main.java', 'App.java', 'Application.java'}),
+    '.rb': frozenset({'main.rb', 'app.rb', 'application.rb'}),
+    '.php': frozenset({'index.php', 'app.php'}),
+    '.cs': frozenset({'Program.cs', 'Startup.cs'}),
+}
+_ALL_EXTS = frozenset(_IMPORTANT_PATTERNS)
+
+# Base rank by file name: entry points 0, anything else defaults to 2.
+# File names carry their extension, so one table serves every language.
+_ENTRY_RANK = {name: 0 for names in _IMPORTANT_PATTERNS.values() for name in names}
+
+# Directories whose files rank above the rest of the repository
+_PRIMARY_DIRS = frozenset({'src', 'lib', 'app'})
+
+# Project type reported for each source extension
+_EXT_TO_LANG = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.java': 'Java',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.cs': 'C#',
+}
+
+# Source files above this size are never considered for the prompt
+_MAX_FILE_SIZE = 256 * 1024
+
+# Cap on source code sent in the prompt, at roughly 4 characters per token
+_MAX_PROMPT_CHARS = 4 * 16000
+
+
+def _read_yaml(path: Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader."""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def _walk(root: str, ignore: FrozenSet[str], wanted: FrozenSet[str],
+          max_size: int) -> Iterator[Tuple[str, str, int]]:
+    """
+    Walk a directory tree once, yielding (extension, path, size) for wanted files.
+    
+    Directories named in ``ignore`` (or ending in ``.egg-info``) are pruned
+    without being entered. Symlinked directories are not followed. Files
+    larger than ``max_size`` bytes, typically generated bundles, are skipped.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in ignore and not name.endswith('.egg-info'):
+                            stack.append(entry.path)
+                        continue
+                    ext = os.path.splitext(name)[1]
+                    if ext not in wanted:
+                        continue
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        continue
+                    if size <= max_size:
+                        yield ext, entry.path, size
+        except OSError:
+            continue
+
+
+if hasattr(os, 'readv'):
+    def _readinto(fd: int, buf: memoryview) -> int:
+        """Read from fd directly into buf, returning the byte count."""
+        return os.readv(fd, [buf])
+else:
+    def _readinto(fd: int, buf: memoryview) -> int:
+        """Read from fd into buf (copying fallback where readv is missing)."""
+        data = os.read(fd, len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+
 class ReadmeGenerator:
     """
     Generates repository documentation by analyzing code structure.
@@ -23,17 +138,31 @@ class ReadmeGenerator:
         2. ~/.config/read-you/ (user)
         3. /etc/read-you/ (system)
         
+        The OpenAI client is created on first use of ``client``, so
+        analysis-only callers never build it.
+        
         Raises:
             FileNotFoundError: If no config found
-            ValueError: If API key invalid/missing
         """
         self.config = self._load_config()
-        self.client = self._init_openai()
+        self.model = self.config['openai'].get('model', 'gpt-4-0125-preview')
+        
+    @functools.cached_property
+    def client(self) -> openai.OpenAI:
+        """
+        OpenAI client, initialized on first access.
+        
+        Raises:
+            ValueError: If API key invalid/missing
+        """
+        return self._init_openai()
         
     def _load_config(self) -> Dict:
         """
         Load and merge configuration files.
         
+        Configs are read once per process and cached by config directory.
+        
         Returns:
             Dict: Merged configuration
             
@@ -56,8 +185,14 @@ class ReadmeGenerator:
             config_dir = possible_config_dirs[1]
             config_dir.mkdir(parents=True, exist_ok=True)
             self._copy_default_configs(config_dir)
-            
-        return self._read_configs(config_dir)
+
+        config_dir = config_dir.resolve()
+        with _CONFIG_LOCK:
+            config = _CONFIG_CACHE.get(config_dir)
+            if config is None:
+                config = _CONFIG_CACHE[config_dir] = self._read_configs(config_dir)
+        # Hand out a private copy so instances can't mutate the shared config
+        return copy.deepcopy(config)
     
     def _copy_default_configs(self, target_dir: Path) -> None:
         """Copy default config files to target directory."""
@@ -71,6 +206,9 @@ class ReadmeGenerator:
         """
         Read and merge example.yaml and secrets.yaml.
         
+        The merged result is pickled to ~/.cache/read-you/ and reused
+        while both files keep the same mtime and size.
+        
         Args:
             config_dir: Directory containing config files
             
@@ -81,29 +219,70 @@ class ReadmeGenerator:
             FileNotFoundError: Missing example.yaml
             ValueError: Invalid YAML or missing API key
         """
+        example_path = config_dir / 'example.yaml'
+        secrets_path = config_dir / 'secrets.yaml'
         try:
-            with open(config_dir / 'example.yaml') as f:
-                config = yaml.safe_load(f)
+            example_stat = os.stat(example_path)
         except FileNotFoundError:
-            raise FileNotFoundError(
-                f"Configuration not found in: {[str(d) for d in possible_config_dirs]}"
-            )
+            raise FileNotFoundError(f"Configuration not found in: {config_dir}")
             
-        secrets_path = config_dir / 'secrets.yaml'
-        if not secrets_path.exists():
+        try:
+            secrets_stat = os.stat(secrets_path)
+        except FileNotFoundError:
             raise ValueError(
                 f"No secrets.yaml found. Create {secrets_path} with your OpenAI API key"
             )
             
+        # Reuse the last merged config while neither file has changed
+        cache_key = (
+            os.fspath(config_dir),
+            example_stat.st_mtime_ns, example_stat.st_size,
+            secrets_stat.st_mtime_ns, secrets_stat.st_size,
+        )
+        config = self._read_config_cache(cache_key)
+        if config is not None:
+            return config
+            
+        # Overlap the two reads; leaving the with block waits for both
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            example_future = executor.submit(_read_yaml, example_path)
+            secrets_future = executor.submit(_read_yaml, secrets_path)
+        config = example_future.result()
+            
         try:
-            with open(secrets_path) as f:
-                secrets = yaml.safe_load(f)
-                self._merge_configs(config, secrets)
+            secrets = secrets_future.result()
+            self._merge_configs(config, secrets)
         except Exception as e:
             raise ValueError(f"Error reading secrets.yaml: {e}")
             
+        self._write_config_cache(cache_key, config)
         return config
     
+    def _read_config_cache(self, key: Tuple) -> Optional[Dict]:
+        """Return the pickled config if it was stored under key, else None."""
+        try:
+            with open(_CONFIG_CACHE_FILE, 'rb') as f:
+                cached_key, config = pickle.load(f)
+        except Exception:
+            return None
+        return config if cached_key == key else None
+    
+    def _write_config_cache(self, key: Tuple, config: Dict) -> None:
+        """Atomically pickle config under key; failures are ignored."""
+        try:
+            _CONFIG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            # mkstemp creates the file 0600, which matters since it holds the API key
+            fd, tmp_path = tempfile.mkstemp(dir=_CONFIG_CACHE_FILE.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, _CONFIG_CACHE_FILE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            pass
+    
     def _init_openai(self) -> openai.OpenAI:
         """
         Initialize OpenAI client.
@@ -118,119 +297,170 @@ class ReadmeGenerator:
         if not api_key or api_key in ["YOUR-API-KEY-GOES-IN-SECRETS.YAML", "your-actual-api-key-here"]:
             raise ValueError("Invalid API key. Add your OpenAI key to secrets.yaml")
             
-        self.model = self.config['openai'].get('model', 'gpt-4-0125-preview')
         return openai.OpenAI(api_key=api_key)
     
     def _merge_configs(self, base: Dict, override: Dict) -> None:
         """Deep merge override dict into base dict."""
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_configs(base[key], value)
-            else:
-                base[key] = value
+        # Explicit stack of (base, override) pairs instead of recursion
+        stack = [(base, override)]
+        while stack:
+            base_dict, override_dict = stack.pop()
+            for key, value in override_dict.items():
+                if isinstance(value, dict) and isinstance(base_dict.get(key), dict):
+                    stack.append((base_dict[key], value))
+                else:
+                    base_dict[key] = value
                 
-    def analyze_directory(self, directory: Path) -> Dict[str, List[str]]:
-        """Analyze a directory and collect relevant code files."""
-        file_contents = {}
-        # Define directories to ignore
-        ignore_dirs = {'.git', 'node_modules', '.venv', 'venv', '__pycache__', 'build', 'dist', '*.egg-info'}
+    def analyze_directory(self, directory: Path, max_chars: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Analyze a directory and collect relevant code files.
         
-        # Common entry points and important files by language
-        important_patterns = {
-            '.py': ['main.py', 'app.py', 'index.py', 'setup.py'],
-            '.js': ['index.js', 'main.js', 'app.js', 'server.js'],
-            '.ts': ['index.ts', 'main.ts', 'app.ts', 'server.ts'],
-            '.go': ['main.go', 'app.go', 'server.go'],
-            '.rs': ['main.rs', 'lib.rs'],
-            '.java': ['Main.java', 'App.java', 'Application.java'],
-            '.rb': ['main.rb', 'app.rb', 'application.rb'],
-            '.php': ['index.php', 'app.php'],
-            '.cs': ['Program.cs', 'Startup.cs']
-        }
+        Args:
+            directory: Repository root to scan
+            max_chars: Budget for the combined size of the returned contents;
+                files that don't fit are never read, except each language's
+                top-ranked one, which is truncated to fit
+                
+        Returns:
+            Dict[str, List[str]]: File contents by extension, most important
+            first; extensions are ordered by file count in the repository,
+            most common first
+        """
+        file_contents = {}
 
-        # First pass: Find all code files and identify primary language
-        language_counts = {}
-        all_files = []
-        for ext in important_patterns.keys():
-            files = list(directory.rglob(f'*{ext}'))
-            valid_files = []
-            for file in files:
-                if not any(ignore_dir in str(file) for ignore_dir in ignore_dirs):
-                    valid_files.append(file)
-            if valid_files:
-                language_counts[ext] = len(valid_files)
-                all_files.extend(valid_files)
+        # Single pass: count files per extension while keeping only the top 5
+        # candidates of each, sorted best first so kept[-1] is the worst.
+        # Rank: 0 = entry point in a primary dir, 1 = entry point elsewhere,
+        # 2 = other file in a primary dir, 3 = anything else. The relative
+        # path breaks ties, so the selection doesn't depend on the
+        # filesystem's directory order.
+        # Paths stay plain strings relative to the resolved root until read.
+        root = os.fspath(Path(directory).resolve())
+        prefix_len = len(os.path.join(root, ''))
+        language_counts = dict.fromkeys(_IMPORTANT_PATTERNS, 0)
+        top_files: Dict[str, List[Tuple[int, str, str, int]]] = {ext: [] for ext in _IMPORTANT_PATTERNS}
+        for ext, path, size in _walk(root, _IGNORE_DIRS, _ALL_EXTS, _MAX_FILE_SIZE):
+            language_counts[ext] += 1
+            relative_path = path[prefix_len:]
+            *dirs, name = relative_path.split(os.sep)
+            in_primary_dir = not _PRIMARY_DIRS.isdisjoint(dirs)
+            priority = _ENTRY_RANK.get(name, 2) + (0 if in_primary_dir else 1)
+            kept = top_files[ext]
+            if len(kept) < 5:
+                bisect.insort(kept, (priority, relative_path, path, size))
+            elif (priority, relative_path) < kept[-1][:2]:
+                # Outranks the worst kept file, which drops out
+                kept.pop()
+                bisect.insort(kept, (priority, relative_path, path, size))
 
+        language_counts = {ext: count for ext, count in language_counts.items() if count}
         if not language_counts:
             raise ValueError("No recognized source code files found in the repository")
 
         # Determine primary language(s)
         max_count = max(language_counts.values())
         primary_languages = [ext for ext, count in language_counts.items() if count >= max_count * 0.3]  # Languages with at least 30% of max files
+        primary_languages.sort(key=language_counts.get, reverse=True)  # Most common first
 
-        # Second pass: Organize and prioritize files
+        # Most important files (entry points and core modules) first
+        selected = []
         for ext in primary_languages:
-            files_by_importance = []
-            
-            # 1. First priority: Known entry points in src/ or primary directories
-            for pattern in important_patterns[ext]:
-                for file in all_files:
-                    if file.name == pattern and ext in str(file):
-                        if 'src/' in str(file) or 'lib/' in str(file) or 'app/' in str(file):
-                            files_by_importance.insert(0, file)
-                        else:
-                            files_by_importance.append(file)
+            selected.extend(
+                (ext, path, relative_path, size)
+                for _, relative_path, path, size in top_files[ext]
+            )
 
-            # 2. Second priority: Other files in src/ or primary directories
-            for file in all_files:
-                if ext in str(file) and file not in files_by_importance:
-                    if 'src/' in str(file) or 'lib/' in str(file) or 'app/' in str(file):
-                        files_by_importance.append(file)
+        # Fit the selection to the budget before reading anything. Every
+        # primary language keeps its top-ranked file; when those alone
+        # overflow, each is truncated but still gets an equal share of the
+        # budget. Other files are skipped if they don't fit, while smaller
+        # ones after them are still tried.
+        # Decoded UTF-8 never has more characters than bytes, so the size bounds it.
+        limits: List[Optional[int]] = [None] * len(selected)
+        if max_chars is not None and selected:
+            costs = [size + len(f"# File: {relative_path}\n\n") for _, _, relative_path, size in selected]
+            tops = [i for i, (ext, _, _, _) in enumerate(selected) if i == 0 or ext != selected[i - 1][0]]
+            share = max_chars // len(tops)
+            reserved = [min(costs[i], share) for i in tops]
+            chosen: Dict[int, Optional[int]] = {}
+            remaining = max_chars
+            for n, i in enumerate(tops):
+                allowed = remaining - sum(reserved[n + 1:])
+                if costs[i] <= allowed:
+                    chosen[i] = None
+                    remaining -= costs[i]
+                else:
+                    overhead = costs[i] - selected[i][3]
+                    chosen[i] = max(allowed - overhead, 0)
+                    remaining -= overhead + chosen[i]
+            for i, cost in enumerate(costs):
+                if i not in chosen and cost <= remaining:
+                    chosen[i] = None
+                    remaining -= cost
+            selected = [selected[i] for i in sorted(chosen)]
+            limits = [chosen[i] for i in sorted(chosen)]
 
-            # 3. Third priority: Remaining files
-            for file in all_files:
-                if ext in str(file) and file not in files_by_importance:
-                    files_by_importance.append(file)
+        # Read the selected files concurrently; map() preserves submission order
+        if selected:
+            with ThreadPoolExecutor(max_workers=min(16, len(selected))) as executor:
+                _, paths, relative_paths, _ = zip(*selected)
+                results = executor.map(self._read_source_file, paths, relative_paths, limits)
+                for (ext, _, _, _), content in zip(selected, results):
+                    if content is not None:
+                        file_contents.setdefault(ext, []).append(content)
 
-            # Limit to most important files (entry points and core modules)
-            files_by_importance = files_by_importance[:5]  # Limit to top 5 most important files
+        return file_contents
 
-            if files_by_importance:
-                file_contents[ext] = []
-                for file in files_by_importance:
+    def _read_source_file(self, path: str, relative_path: str, limit: Optional[int] = None) -> Optional[str]:
+        """
+        Read a source file, prefixed with its relative path and newline-terminated.
+        
+        If ``limit`` is given, at most that many bytes of the file are read.
+        """
+        header = f"# File: {relative_path}\n".encode('utf-8', errors='surrogateescape')
+        start = len(header)
+        try:
+            # Source files are small: read straight into one buffer sized from
+            # fstat that already holds the header, then decode it all once
+            fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                if limit is not None:
+                    size = min(size, limit)
+                if hasattr(os, 'posix_fadvise'):
                     try:
-                        with open(file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            relative_path = file.relative_to(directory)
-                            file_contents[ext].append(f"# File: {relative_path}\n{content}")
-                    except Exception as e:
-                        print(f"Error reading {file}: {e}")
-
-        return file_contents
+                        os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass  # only a readahead hint
+                buf = bytearray(start + size + 1)
+                buf[:start] = header
+                view = memoryview(buf)
+                filled = start
+                while filled < start + size:
+                    n = _readinto(fd, view[filled:start + size])
+                    if not n:
+                        break
+                    filled += n
+            finally:
+                os.close(fd)
+        except Exception as e:
+            print(f"Error reading {path}: {e}")
+            return None
+        buf[filled] = ord('\n')
+        # Raw reads skip open()'s universal newlines, so normalize them here
+        content = str(view[:filled + 1], 'utf-8', 'replace')
+        return content.replace('\r\n', '\n').replace('\r', '\n')
 
     def _detect_project_type(self, file_contents: Dict[str, List[str]]) -> str:
         """Detect the primary project type based on files found."""
         if not file_contents:
             return "Unknown"
         
-        # Count files by extension
-        ext_counts = {ext: len(files) for ext, files in file_contents.items()}
-        primary_ext = max(ext_counts, key=ext_counts.get)
+        # analyze_directory orders extensions by repository-wide file count;
+        # the number of contents per extension is shaped by the prompt budget
+        primary_ext = next(iter(file_contents))
         
-        # Map extensions to project types
-        type_mapping = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.java': 'Java',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.cs': 'C#'
-        }
-        
-        return type_mapping.get(primary_ext, "Unknown")
+        return _EXT_TO_LANG.get(primary_ext, "Unknown")
 
     def generate_readme(self, repo_path: Union[str, Path], verbose: bool = False) -> str:
         """
@@ -248,7 +478,7 @@ class ReadmeGenerator:
             Exception: OpenAI API errors
         """
         directory = Path(repo_path)
-        file_contents = self.analyze_directory(directory)
+        file_contents = self.analyze_directory(directory, max_chars=_MAX_PROMPT_CHARS)
         project_type = self._detect_project_type(file_contents)
         
         footer = f"\n\n---\n*This README was automatically generated using [read-you](https://github.com/yourusername/read-you)*"
@@ -293,13 +523,12 @@ class ReadmeGenerator:
             Do not add any footer - it will be added automatically.
             """
         
-        prompt += "\nHere's the actual code to analyze:\n"
-        
+        parts = [prompt, "\nHere's the actual code to analyze:\n"]
         for ext, contents in file_contents.items():
             if contents:
-                prompt += f"\n{ext} files:\n"
-                for content in contents:
-                    prompt += f"{content}\n"
+                parts.append(f"\n{ext} files:\n")
+                parts.extend(contents)
+        prompt = "".join(parts)
 
         # Generate README using OpenAI
         response = self.client.chat.completions.create(
@@ -0,0 +1,17 @@
+import pytest
+import src.readme_generator as readme_generator
+from src.readme_generator import ReadmeGenerator
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_config_cache(tmp_path_factory):
+    # Keep the pickled config (which holds the API key) out of the real ~/.cache.
+    # The in-process config cache is left alone so the suite parses YAML once.
+    cache_file = tmp_path_factory.mktemp('cache') / 'config.pkl'
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(readme_generator, '_CONFIG_CACHE_FILE', cache_file)
+        yield cache_file
+
+@pytest.fixture(scope='session')
+def generator(isolated_config_cache):
+    # One shared instance; config is loaded once per test run
+    return ReadmeGenerator()
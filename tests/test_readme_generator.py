@@ -21,14 +21,107 @@ def sample_repo(tmp_path):
     
     return repo_dir
 
-def test_analyze_directory(sample_repo):
-    generator = ReadmeGenerator()
+def test_analyze_directory(generator, sample_repo):
     results = generator.analyze_directory(sample_repo)
     
     assert '.py' in results
     assert len(results['.py']) == 2
     assert 'def main():' in results['.py'][0] or results['.py'][1]
 
+def test_analyze_directory_prioritizes_entry_points(generator, sample_repo):
+    for i in range(6):
+        (sample_repo / f"helper_{i}.py").write_text(f"HELPER = {i}")
+    (sample_repo / "scripts").mkdir()
+    (sample_repo / "scripts" / "app.py").write_text("APP = True")
+    
+    results = generator.analyze_directory(sample_repo)
+    
+    assert len(results['.py']) == 5
+    assert results['.py'][0].startswith(f"# File: {Path('src', 'main.py')}")
+    assert results['.py'][1].startswith(f"# File: {Path('scripts', 'app.py')}")
+    assert results['.py'][2].startswith(f"# File: {Path('src', 'utils.py')}")
+
+def test_analyze_directory_breaks_ties_by_path(generator, tmp_path):
+    (tmp_path / "web").mkdir()
+    for i in (7, 1, 9, 4, 0, 8, 3, 6, 2, 5):
+        (tmp_path / "web" / f"f{i}.js").write_text(f"F = {i}")
+    
+    results = generator.analyze_directory(tmp_path)
+    
+    assert [content.splitlines()[0] for content in results['.js']] == [
+        f"# File: {Path('web', f'f{i}.js')}" for i in range(5)
+    ]
+
+def test_analyze_directory_respects_max_chars(generator, sample_repo):
+    results = generator.analyze_directory(sample_repo, max_chars=60)
+    
+    assert len(results['.py']) == 1
+    assert 'def main():' in results['.py'][0]
+
+def test_analyze_directory_skips_oversized_files(generator, sample_repo):
+    (sample_repo / "bundle.py").write_text("x = 1\n" * 100_000)
+    
+    results = generator.analyze_directory(sample_repo)
+    
+    assert len(results['.py']) == 2
+    assert not any('bundle.py' in content for content in results['.py'])
+
+def test_analyze_directory_truncates_oversized_top_file(generator, sample_repo):
+    (sample_repo / "src" / "main.py").write_text("x = 1\n" * 100)
+    (sample_repo / "tool.py").write_text("T = 1")
+    
+    results = generator.analyze_directory(sample_repo, max_chars=200)
+    
+    assert list(results) == ['.py']
+    assert len(results['.py']) == 1
+    assert results['.py'][0].startswith(f"# File: {Path('src', 'main.py')}\nx = 1\n")
+    assert len(results['.py'][0]) == 200
+
+def test_analyze_directory_skips_files_over_budget(generator, sample_repo):
+    (sample_repo / "src" / "big.py").write_text("x = 1\n" * 100)
+    (sample_repo / "tool.py").write_text("T = 1")
+    
+    results = generator.analyze_directory(sample_repo, max_chars=200)
+    
+    contents = "".join(results['.py'])
+    assert len(results['.py']) == 3
+    assert 'big.py' not in contents
+    assert 'def main():' in contents and 'def helper():' in contents and 'T = 1' in contents
+
+def test_analyze_directory_budget_keeps_every_primary_language(generator, sample_repo):
+    for i in range(2):
+        (sample_repo / f"extra_{i}.py").write_text("P = 1\n" * 50)
+    for i in range(5):
+        (sample_repo / f"page_{i}.js").write_text("J = 1\n" * 50)
+    
+    results = generator.analyze_directory(sample_repo, max_chars=400)
+    
+    assert list(results) == ['.js', '.py']
+    assert results['.js'][0].startswith("# File: page_0.js")
+    assert results['.py'][0].startswith(f"# File: {Path('src', 'main.py')}")
+    assert sum(len(content) for contents in results.values() for content in contents) <= 400
+    assert generator._detect_project_type(results) == 'JavaScript'
+
+def test_analyze_directory_normalizes_newlines(generator, sample_repo):
+    (sample_repo / "src" / "main.py").write_bytes(b"a = 1\r\nb = 2\r\n")
+    
+    results = generator.analyze_directory(sample_repo)
+    
+    main = next(content for content in results['.py'] if 'main.py' in content)
+    assert '\r' not in main
+    assert 'a = 1\nb = 2\n' in main
+
+def test_analyze_directory_skips_ignored_dirs(generator, sample_repo):
+    (sample_repo / "node_modules" / "pkg").mkdir(parents=True)
+    (sample_repo / "node_modules" / "pkg" / "vendored.py").write_text("VENDORED = True")
+    (sample_repo / "pkg.egg-info").mkdir()
+    (sample_repo / "pkg.egg-info" / "meta.py").write_text("META = True")
+    
+    results = generator.analyze_directory(sample_repo)
+    
+    assert len(results['.py']) == 2
+    assert not any('VENDORED' in content or 'META' in content for content in results['.py'])
+
 @patch('openai.OpenAI')
 def test_generate_readme_non_verbose(mock_openai, sample_repo, mock_openai_response):
     mock_openai.return_value.chat.completions.create.return_value = mock_openai_response
@@ -57,8 +150,38 @@ def test_generate_readme_verbose(mock_openai, sample_repo, mock_openai_response)
     assert "comprehensive README" in call_args['messages'][1]['content']
     assert call_args['max_tokens'] == 2000
 
-def test_save_readme(sample_repo):
-    generator = ReadmeGenerator()
+@pytest.fixture
+def config_dir(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "example.yaml").write_text("openai:\n  api_key: placeholder\n  model: base-model\n")
+    (config_dir / "secrets.yaml").write_text("openai:\n  api_key: sk-test\n")
+    return config_dir
+
+def test_read_configs_uses_disk_cache(generator, config_dir, isolated_config_cache):
+    config = generator._read_configs(config_dir)
+    assert isolated_config_cache.exists()
+    
+    with patch('src.readme_generator._read_yaml', side_effect=AssertionError("YAML re-parsed")):
+        assert generator._read_configs(config_dir) == config
+
+def test_read_configs_reparses_after_secrets_change(generator, config_dir):
+    assert generator._read_configs(config_dir)['openai']['model'] == 'base-model'
+    
+    (config_dir / "secrets.yaml").write_text("openai:\n  api_key: sk-test\n  model: override-model\n")
+    
+    assert generator._read_configs(config_dir)['openai']['model'] == 'override-model'
+
+def test_read_configs_ignores_corrupt_cache(generator, config_dir, isolated_config_cache):
+    isolated_config_cache.write_bytes(b"not a pickle")
+    
+    config = generator._read_configs(config_dir)
+    
+    assert config['openai'] == {'api_key': 'sk-test', 'model': 'base-model'}
+    with patch('src.readme_generator._read_yaml', side_effect=AssertionError("YAML re-parsed")):
+        assert generator._read_configs(config_dir) == config
+
+def test_save_readme(generator, sample_repo):
     content = "# Test README\nThis is a test content."
     generator.save_readme(str(sample_repo), content)
     
@@ -66,8 +189,7 @@ def test_save_readme(sample_repo):
     assert readme_path.exists()
     assert readme_path.read_text() == content
 
-def test_save_readme_dry_run(sample_repo, capsys):
-    generator = ReadmeGenerator()
+def test_save_readme_dry_run(generator, sample_repo, capsys):
     content = "# Test README\nThis is a test content."
     generator.save_readme(str(sample_repo), content, dry_run=True)
     